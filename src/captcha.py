@@ -1,3 +1,5 @@
+import os
+import time
 import logging
 import requests
 from typing import Optional
@@ -9,8 +11,10 @@ class DefaultCAPTCHA:
     def solve(session: requests.Session) -> Optional[str]:
         try:
             logger.info("Applying default CAPTCHA solving logic")
-            import time
-            time.sleep(0.5)
+            # Read per call so values from .env (loaded after import) apply
+            min_delay = float(os.getenv('CAPTCHA_MIN_DELAY', 0))
+            if min_delay > 0:
+                time.sleep(min_delay)
             solved_value = "ABC123"
             logger.info(f"CAPTCHA solved successfully: {solved_value}")
             return solved_value
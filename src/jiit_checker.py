@@ -1,15 +1,28 @@
 import os
+import functools
 import logging
+import math
+import hashlib
 import time
 import re
 import io
-import pdfplumber
+import threading
 import requests
 import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List
 from pyjiit.encryption import serialize_payload
 from session_manager import SessionManager, LoginError
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 class SessionExpired(Exception):
     pass
 
@@ -18,27 +31,106 @@ class APIError(Exception):
 
 logger = logging.getLogger(__name__)
 
+_STOPWORDS = frozenset({'and', 'of', 'the', 'in', 'on', 'for', 'to', 'with', 'by', 'at', 'from'})
+
+_RE_PARENS = re.compile(r'\(([^)]+)\)')
+_RE_YEAR4 = re.compile(r'(\d{4})')
+_RE_YEAR = re.compile(r'(\d{4}|\d{2})')
+_RE_EARLY_DIGIT = re.compile(r'\d')
+_PDF_SKIP_PREFIXES = ('(', 'Page', 'Jaypee', 'Subject', 'Name:', 'Registration',
+                      'Legend', 'OM/FM', 'Thu', 'A-10', 'Noida')
+# Cache entries whose consumers rely on in-memory state (the Semester objects
+# in _sem_index) that cannot be rebuilt from a persisted value
+_NON_PERSISTED_CACHE_KEYS = frozenset({'marks_semesters'})
+# Absent ("A 0.0/20.0"), letter grade ("B 12.5/20.0") or plain "1.5/ 20" rows
+_MARKS_LINE_RE = re.compile(
+    r'^(?:'
+    r'(?P<absent>A)\s+\S*/'
+    r'|(?P<grade>[BCDF])\s+(?P<gval>\d+(?:\.\d+)?)/'
+    r'|(?P<num>\d+(?:\.\d+)?)/'
+    r')'
+)
+
+@functools.lru_cache(maxsize=256)
 def get_short_subject_name(full_name: str) -> str:
-    name = full_name.split('(')[0].strip()
-    stopwords = {'and', 'of', 'the', 'in', 'on', 'for', 'to', 'with', 'by', 'at', 'from'}
-    words = [w for w in name.split() if w.lower() not in stopwords]
-    if not words:
+    name = full_name.partition('(')[0].strip()
+    initials = []
+    has_lab = False
+    for word in name.split():
+        word_upper = word.upper()
+        if 'LAB' in word_upper:
+            has_lab = True
+            if word_upper == 'LAB':
+                continue
+        if word.lower() in _STOPWORDS:
+            continue
+        initials.append(word_upper[0])
+    if not initials and not has_lab:
         return name
-    if 'LAB' in name.upper():
-        abbr = ''.join(word[0].upper() for word in words if word.upper() != 'LAB')
+    abbr = ''.join(initials)
+    if has_lab:
         return f"{abbr} Lab" if abbr else "Lab"
-    else:
-        abbr = ''.join(word[0].upper() for word in words)
-        return abbr
+    return abbr
+
+def _with_retries(fn, attempts=3, base_delay=0.25, description="operation"):
+    for attempt in range(attempts):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == attempts - 1:
+                raise
+            delay = min(base_delay * (2 ** attempt), 2.0)
+            logger.warning("Attempt %s of %s failed, retrying in %.2fs: %s", attempt + 1, description, delay, e)
+            time.sleep(delay)
+
+
+def _semester_reg_code(semester, semester_name: str) -> str:
+    reg_code_match = _RE_PARENS.search(semester_name)
+    reg_code = reg_code_match.group(1) if reg_code_match else ""
+    if not reg_code:
+        reg_code = getattr(semester, 'registration_code', '')
+    return reg_code
+
+@functools.lru_cache(maxsize=64)
+def _build_display_name(semester_name: str, reg_code: str) -> tuple:
+    upper_name = semester_name.upper()
+    reg_code_upper = reg_code.upper() if reg_code else upper_name
+
+    year = None
+    year_match = _RE_YEAR.search(reg_code_upper)
+    if year_match:
+        year_part = year_match.group(1)
+        if len(year_part) == 2:
+            # Assume years 50-99 are 1900s, 00-49 are 2000s
+            year = f"19{year_part}" if int(year_part) >= 50 else f"20{year_part}"
+        else:
+            year = year_part
+    if not year:
+        name_match = _RE_YEAR4.search(upper_name)
+        if name_match:
+            year = name_match.group(1)
+
+    if 'ODD' in reg_code_upper or 'ODD' in upper_name:
+        return (f"Odd {year}" if year else "Odd Semester", 'odd', year)
+    if 'EVE' in reg_code_upper or 'EVEN' in upper_name:
+        return (f"Even {year}" if year else "Even Semester", 'even', year)
+    if 'SUMMER' in reg_code_upper or 'SUMMER' in upper_name:
+        return (f"Summer {year}" if year else "Summer Semester", 'summer', year)
+    return (semester_name if semester_name else "Unknown Semester", 'unknown', year)
+
 
 class JIITChecker:
     def __init__(self, username: str, password: str):
         self.username = username
         self.password = password
         self.session_manager = None
+        self._api_session: Optional[requests.Session] = None
         self.last_attendance_data = {}
         self.last_marks_data = {}
         self.last_notices = []
+        self._last_attendance_digest: Optional[bytes] = None
+        self._last_marks_digest: Optional[bytes] = None
+        self._last_notice_sig: Optional[bytes] = None
 
         self.marks_semesters: List[str] = []
         self.selected_marks_sem: Optional[str] = None
@@ -49,23 +141,85 @@ class JIITChecker:
         self.grades_error: Optional[str] = None
         self.grade_card_loading: bool = False
         self.is_download_dialog_open: bool = False
-        self.marks_cache = {}
-        self.marks_cache_expiry = {}
+        self.marks_cache: OrderedDict = OrderedDict()  # cache_key -> (expiry, value)
         self.cache_duration = 300
+        self._cache_max_entries = 32
+        self._attendance_threshold = float(os.getenv('ATTENDANCE_THRESHOLD', 75))
+        self._login_backoff = 1.0
+        self._login_lock = threading.Lock()
+        self._meta_cache = None
+        self._meta_ts = 0.0
+        self._meta_ttl = 6 * 3600
+        self._detailed_response_cache: Dict[str, tuple] = {}
+        self._sem_index: Dict[str, Any] = {}
+        self._last_pdf_hash: Optional[bytes] = None
+        self._last_pdf_subjects: Dict[str, Dict[str, Any]] = {}
+        user_hash = hashlib.blake2b(str(username).encode(), digest_size=8).hexdigest()
+        self._cache_file = os.path.join(os.path.expanduser('~'), '.portal_plus', f'cache_{user_hash}.json')
+        self._cache_lock = threading.Lock()
+        self._load_cache_file()
+
+    @property
+    def last_notices(self) -> List[Dict[str, Any]]:
+        return self._last_notices
+
+    @last_notices.setter
+    def last_notices(self, value: List[Dict[str, Any]]):
+        self._last_notices = value
+        self._last_notice_id_set = frozenset(notice['id'] for notice in value)
+
+    def _load_cache_file(self):
+        try:
+            with open(self._cache_file, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            now = time.time()
+            with self._cache_lock:
+                for cache_key, (expiry, value) in stored.items():
+                    if now < expiry:
+                        self.marks_cache[cache_key] = (expiry, value)
+            if self.marks_cache:
+                logger.info("Loaded %s cached entries from %s", len(self.marks_cache), self._cache_file)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning("Could not load cache file %s: %s", self._cache_file, e)
 
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        if cache_key not in self.marks_cache_expiry:
-            return False
-        return time.time() < self.marks_cache_expiry[cache_key]
+    def _save_cache_file(self):
+        # Caller must hold _cache_lock
+        try:
+            os.makedirs(os.path.dirname(self._cache_file), exist_ok=True)
+            tmp_path = f"{self._cache_file}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({k: list(v) for k, v in self.marks_cache.items()
+                           if k not in _NON_PERSISTED_CACHE_KEYS}, f, default=str)
+            os.replace(tmp_path, self._cache_file)
+        except Exception as e:
+            logger.warning("Could not persist cache file %s: %s", self._cache_file, e)
 
-    def _set_cache(self, cache_key: str, data: Any):
-        self.marks_cache[cache_key] = data
-        self.marks_cache_expiry[cache_key] = time.time() + self.cache_duration
+    def _is_cache_valid(self, cache_key: str) -> bool:
+        with self._cache_lock:
+            entry = self.marks_cache.get(cache_key)
+            return entry is not None and time.time() < entry[0]
+
+    def _set_cache(self, cache_key: str, data: Any, ttl: Optional[float] = None):
+        with self._cache_lock:
+            self.marks_cache[cache_key] = (time.time() + (ttl or self.cache_duration), data)
+            self.marks_cache.move_to_end(cache_key)
+            while len(self.marks_cache) > self._cache_max_entries:
+                self.marks_cache.popitem(last=False)
+            self._save_cache_file()
 
     def _get_cache(self, cache_key: str) -> Optional[Any]:
-        if self._is_cache_valid(cache_key):
-            return self.marks_cache[cache_key]
-        return None
+        with self._cache_lock:
+            entry = self.marks_cache.get(cache_key)
+            if entry is None:
+                return None
+            expiry, value = entry
+            if time.time() >= expiry:
+                del self.marks_cache[cache_key]
+                return None
+            self.marks_cache.move_to_end(cache_key)
+            return value
 
     def login(self) -> bool:
         try:
@@ -73,24 +227,66 @@ class JIITChecker:
             self.session_manager = SessionManager()
             if self.session_manager.login_simple(self.username, self.password):
                 logger.info("Login successful!")
+                self._meta_cache = None
                 session_info = self.session_manager.get_session_info()
-                logger.info(f"Session active: {session_info}")
+                logger.info("Session active: %s", session_info)
+                self._login_backoff = 1.0
                 return True
             else:
                 logger.error("Login failed")
+                self._apply_login_backoff()
                 return False
         except Exception as e:
-            logger.error(f"Login error: {e}")
+            logger.error("Login error: %s", e)
+            self._apply_login_backoff()
             raise
 
+    def _apply_login_backoff(self):
+        logger.warning("Backing off %.0fs before next login attempt", self._login_backoff)
+        time.sleep(self._login_backoff)
+        self._login_backoff = min(self._login_backoff * 2, 60.0)
+
     def ensure_logged_in(self) -> bool:
-        try:
-            if not self.session_manager or not self.session_manager.is_logged_in():
+        with self._login_lock:
+            try:
+                if not self.session_manager or not self.session_manager.is_logged_in():
+                    return self.login()
+                return True
+            except Exception as e:
+                logger.error("Error checking session validity: %s", e)
                 return self.login()
-            return True
-        except Exception as e:
-            logger.error(f"Error checking session validity: {e}")
-            return self.login()
+
+    @staticmethod
+    def _subjects_digest(subjects: Dict[str, Any]) -> bytes:
+        payload = json.dumps(subjects, sort_keys=True, default=str).encode()
+        return hashlib.blake2b(payload, digest_size=8).digest()
+
+    def _get_api_session(self) -> requests.Session:
+        if self._api_session is None:
+            session = requests.Session()
+            retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self._api_session = session
+        return self._api_session
+
+    def _marks_semesters_fn(self, webportal):
+        # get_semesters_for_marks is missing on older pyjiit; resolve the
+        # fallback once per webportal instead of raising AttributeError per call
+        if getattr(self, '_marks_sem_fn_portal', None) is not webportal:
+            self._marks_sem_fn = getattr(webportal, 'get_semesters_for_marks', None) or webportal.get_semesters_for_grade_card
+            self._marks_sem_fn_portal = webportal
+        return self._marks_sem_fn
+
+    def _get_attendance_meta(self):
+        if self._meta_cache is not None and time.time() - self._meta_ts < self._meta_ttl:
+            return self._meta_cache
+        webportal = self.session_manager.get_webportal()
+        meta = webportal.get_attendance_meta()
+        self._meta_cache = meta
+        self._meta_ts = time.time()
+        return meta
 
     def _get_subject_components(self, subject_data: dict) -> List[Dict[str, str]]:
         components = []
@@ -108,10 +304,9 @@ class JIITChecker:
 
     def _generate_detailed_payload(self, subject_id: str, subject_code: str, subject_data: dict) -> str:
         try:
-            webportal = self.session_manager.get_webportal()
-            meta = webportal.get_attendance_meta()
+            meta = self._get_attendance_meta()
             sem = meta.latest_semester()
-            
+
             payload_data = {
                 "instituteid": "11IN1902J000001",
                 "subjectid": str(subject_id),
@@ -123,7 +318,7 @@ class JIITChecker:
             
             return serialize_payload(payload_data)
         except Exception as e:
-            logger.error(f"Error generating payload: {e}")
+            logger.error("Error generating payload: %s", e)
             return None
 
     def _get_detailed_subject_attendance(self, subject_id: str, subject_code: str, subject_data: dict) -> Optional[Dict[str, Any]]:
@@ -146,24 +341,34 @@ class JIITChecker:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             
-            session = requests.Session()
-            session.headers.update(request_headers)
-            
+            session = self._get_api_session()
+
             api_url = "https://webportal.jiit.ac.in:6011/StudentPortalAPI/StudentClassAttendance/getstudentsubjectpersentage"
-            response = session.post(api_url, json=payload, timeout=30)
+            response = session.post(api_url, json=payload, headers=request_headers, timeout=30)
             
             if response.status_code == 200:
-                return response.json()
+                body = response.content
+                digest = hashlib.blake2b(body, digest_size=8).digest()
+                cached = self._detailed_response_cache.get(subject_id)
+                if cached and cached[0] == digest:
+                    return cached[1]
+                parsed = _json_loads(body)
+                self._detailed_response_cache[subject_id] = (digest, parsed)
+                return parsed
             else:
-                logger.warning(f"Detailed API failed for {subject_code}: {response.status_code}")
+                logger.warning("Detailed API failed for %s: %s", subject_code, response.status_code)
                 return None
                 
         except Exception as e:
-            logger.warning(f"Error getting detailed attendance for {subject_code}: {e}")
+            logger.warning("Error getting detailed attendance for %s: %s", subject_code, e)
             return None
 
     def fetch_attendance(self) -> Dict[str, Any]:
         try:
+            cached = self._get_cache('attendance')
+            if cached is not None:
+                logger.info("Using cached attendance data")
+                return cached
             if not self.ensure_logged_in():
                 raise LoginError("Failed to establish valid session")
             logger.info("Fetching attendance data with detailed API...")
@@ -172,42 +377,47 @@ class JIITChecker:
             if not webportal:
                 raise APIError("No webportal session available")
             
-            meta = webportal.get_attendance_meta()
+            meta = self._get_attendance_meta()
             header = meta.latest_header()
             sem = meta.latest_semester()
             attendance_response = webportal.get_attendance(header, sem)
-            
+            records = attendance_response.get('studentattendancelist') or []
+            current_semester = attendance_response.get('currentSem', 'Unknown')
+            attendance_response = None
+
             basic_subjects = {}
-            if 'studentattendancelist' in attendance_response:
-                for subject_data in attendance_response['studentattendancelist']:
-                    subject_code = subject_data.get('subjectcode', 'Unknown Subject')
-                    
-                    l_total = int(subject_data.get('Ltotalclass', 0) or 0)
-                    l_present = int(subject_data.get('Ltotalpres', 0) or 0)
-                    t_total = int(subject_data.get('Ttotalclass', 0) or 0)
-                    t_present = int(subject_data.get('Ttotalpres', 0) or 0)
-                    p_total = int(subject_data.get('Ptotalclass', 0) or 0)
-                    p_present = int(subject_data.get('Ptotalpres', 0) or 0)
-                    overall_ltp_percentage = float(subject_data.get('LTpercantage', 0.0) or 0.0)
-                    
-                    subject_total = l_total + t_total + p_total
-                    subject_present = l_present + t_present + p_present
-                    
-                    if subject_total == 0:
-                        continue
-                        
-                    basic_subjects[subject_code] = {
-                        'total': subject_total,
-                        'attended': subject_present,
-                        'percentage': overall_ltp_percentage if overall_ltp_percentage > 0 else (subject_present / subject_total * 100),
-                        'subject_id': subject_data.get('subjectid', ''),
-                        'individual_subject_code': subject_data.get('individualsubjectcode', ''),
-                        'component_ids': {
-                            'lecture': subject_data.get('Lsubjectcomponentid', ''),
-                            'tutorial': subject_data.get('Tsubjectcomponentid', ''),
-                            'practical': subject_data.get('Psubjectcomponentid', '')
-                        }
+            _int = int
+            _float = float
+            for subject_data in records:
+                get = subject_data.get
+                subject_code = get('subjectcode', 'Unknown Subject')
+
+                l_total = _int(get('Ltotalclass') or 0)
+                l_present = _int(get('Ltotalpres') or 0)
+                t_total = _int(get('Ttotalclass') or 0)
+                t_present = _int(get('Ttotalpres') or 0)
+                p_total = _int(get('Ptotalclass') or 0)
+                p_present = _int(get('Ptotalpres') or 0)
+                overall_ltp_percentage = _float(get('LTpercantage') or 0.0)
+
+                subject_total = l_total + t_total + p_total
+                subject_present = l_present + t_present + p_present
+
+                if subject_total == 0:
+                    continue
+
+                basic_subjects[subject_code] = {
+                    'total': subject_total,
+                    'attended': subject_present,
+                    'percentage': overall_ltp_percentage if overall_ltp_percentage > 0 else (subject_present / subject_total * 100),
+                    'subject_id': get('subjectid', ''),
+                    'individual_subject_code': get('individualsubjectcode', ''),
+                    'component_ids': {
+                        'lecture': get('Lsubjectcomponentid', ''),
+                        'tutorial': get('Tsubjectcomponentid', ''),
+                        'practical': get('Psubjectcomponentid', '')
                     }
+                }
             
             enhanced_subjects = {}
             total_classes = 0
@@ -229,7 +439,7 @@ class JIITChecker:
                         total_classes_subject = len(attendance_list)
                         present_count = sum(1 for record in attendance_list if record.get('present') == 'Present')
                         absent_count = total_classes_subject - present_count
-                        percentage = (present_count / total_classes_subject * 100) if total_classes_subject > 0 else 0
+                        percentage = present_count / total_classes_subject * 100
                         
                         enhanced_subjects[subject_name] = {
                             'total': total_classes_subject,
@@ -256,23 +466,25 @@ class JIITChecker:
                 'attended_classes': total_attended,
                 'attendance_percentage': overall_percentage,
                 'subjects': enhanced_subjects,
-                'current_semester': attendance_response.get('currentSem', 'Unknown'),
+                'current_semester': current_semester,
                 'last_updated': time.time(),
                 'enhanced': True
             }
             
-            logger.info(f"Enhanced attendance fetched: {overall_percentage:.1f}% across {len(enhanced_subjects)} subjects")
+            self._set_cache('attendance', attendance_data, ttl=30)
+            logger.info("Enhanced attendance fetched: %.1f%% across %s subjects", overall_percentage, len(enhanced_subjects))
             return attendance_data
             
         except Exception as e:
-            logger.error(f"Error fetching attendance: {e}")
+            logger.error("Error fetching attendance: %s", e)
             raise
 
-    def fetch_marks(self) -> Dict[str, Any]:
+    def fetch_marks(self, include_subjects: bool = True) -> Dict[str, Any]:
         try:
-            if self._is_cache_valid('latest_marks'):
+            cached_marks = self._get_cache('latest_marks')
+            if cached_marks is not None:
                 logger.info("Using cached latest marks data")
-                return self.marks_data
+                return cached_marks
 
             self.marks_loading = True
 
@@ -284,28 +496,14 @@ class JIITChecker:
             if not webportal:
                 raise APIError("No webportal session available")
 
-            max_retries = 3
-            sgpa_cgpa_data = None
-            for attempt in range(max_retries):
-                try:
-                    sgpa_cgpa_data = webportal.get_sgpa_cgpa()
-                    break
-                except Exception as e:
-                    if attempt == max_retries - 1:
-                        raise e
-                    logger.warning(f"Attempt {attempt + 1} failed to fetch SGPA/CGPA, retrying: {e}")
-                    time.sleep(1)
-
-            semesters = None
-            for attempt in range(max_retries):
-                try:
-                    semesters = webportal.get_semesters_for_grade_card()
-                    break
-                except Exception as e:
-                    if attempt == max_retries - 1:
-                        raise e
-                    logger.warning(f"Attempt {attempt + 1} failed to fetch semesters, retrying: {e}")
-                    time.sleep(1)
+            # SGPA/CGPA and the semester list are independent round-trips
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                sgpa_future = executor.submit(_with_retries, webportal.get_sgpa_cgpa,
+                                              description="SGPA/CGPA fetch")
+                semesters_future = executor.submit(_with_retries, webportal.get_semesters_for_grade_card,
+                                                   description="semester list fetch")
+                sgpa_cgpa_data = sgpa_future.result()
+                semesters = semesters_future.result()
 
             marks_data = {
                 'subjects': {},
@@ -315,19 +513,11 @@ class JIITChecker:
                 'last_updated': time.time()
             }
 
-            if semesters:
+            if include_subjects and semesters:
                 try:
                     latest_semester = semesters[-1]
-                    grade_card = None
-                    for attempt in range(max_retries):
-                        try:
-                            grade_card = webportal.get_grade_card(latest_semester)
-                            break
-                        except Exception as e:
-                            if attempt == max_retries - 1:
-                                raise e
-                            logger.warning(f"Attempt {attempt + 1} failed to fetch grade card, retrying: {e}")
-                            time.sleep(1)
+                    grade_card = _with_retries(lambda: webportal.get_grade_card(latest_semester),
+                                               description="grade card fetch")
 
                     if grade_card:
                         for subject_grade in grade_card:
@@ -341,18 +531,19 @@ class JIITChecker:
                                 'total': total_marks
                             }
                 except Exception as e:
-                    logger.warning(f"Could not fetch grade card: {e}")
+                    logger.warning("Could not fetch grade card: %s", e)
 
-            self.marks_data = marks_data
-            self._set_cache('latest_marks', marks_data)
+            if include_subjects:
+                self.marks_data = marks_data
+                self._set_cache('latest_marks', marks_data)
             self.marks_loading = False
 
-            logger.info(f"Latest marks fetched: CGPA {marks_data['cgpa']}")
+            logger.info("Latest marks fetched: CGPA %s", marks_data['cgpa'])
             return marks_data
 
         except Exception as e:
             self.marks_loading = False
-            logger.error(f"Error fetching latest marks: {e}")
+            logger.error("Error fetching latest marks: %s", e)
             raise
 
     def fetch_semesters(self) -> List[Dict[str, str]]:
@@ -369,37 +560,10 @@ class JIITChecker:
                 semester_counter = 1
                 for semester in semesters:
                     semester_name = getattr(semester, 'semester_name', str(semester))
-                    logger.info(f"Processing semester: {semester_name}")
-
-                    # Extract registration code from semester name (usually in parentheses)
-                    import re
-                    reg_code_match = re.search(r'\(([^)]+)\)', semester_name)
-                    reg_code = reg_code_match.group(1) if reg_code_match else ""
-
-                    # If no parentheses, try to extract from the semester object attributes
-                    if not reg_code:
-                        reg_code = getattr(semester, 'registration_code', '')
-
-                    year = None
-                    reg_code_upper = reg_code.upper() if reg_code else semester_name.upper()
-                    if reg_code:
-                        import re
-                        year_match = re.search(r'(\d{4})', reg_code)
-                        if year_match:
-                            year = year_match.group(1)
-
-                    if 'ODD' in reg_code_upper or 'ODD' in semester_name.upper():
-                        semester_type = "odd"
-                        display_name = f"Odd {year}" if year else "Odd Semester"
-                    elif 'EVE' in reg_code_upper or 'EVEN' in semester_name.upper():
-                        semester_type = "even"
-                        display_name = f"Even {year}" if year else "Even Semester"
-                    elif 'SUMMER' in reg_code_upper or 'SUMMER' in semester_name.upper():
-                        semester_type = "summer"
-                        display_name = f"Summer {year}" if year else "Summer Semester"
-                    else:
-                        semester_type = "unknown"
-                        display_name = semester_name if semester_name else "Unknown Semester"
+                    logger.debug("Processing semester: %s", semester_name)
+
+                    reg_code = _semester_reg_code(semester, semester_name)
+                    display_name, semester_type, _year = _build_display_name(semester_name, reg_code)
 
                     semester_list.append({
                         'original_name': semester_name,
@@ -410,18 +574,20 @@ class JIITChecker:
                     })
                     semester_counter += 1
 
-            logger.info(f"Fetched {len(semester_list)} semesters")
+            logger.info("Fetched %s semesters", len(semester_list))
             return semester_list
         except Exception as e:
-            logger.error(f"Error fetching semesters: {e}")
+            logger.error("Error fetching semesters: %s", e)
             raise
 
     def fetch_marks_semesters(self) -> List[str]:
         try:
             # Check cache first
-            if self._is_cache_valid('marks_semesters'):
+            cached_semesters = self._get_cache('marks_semesters')
+            if cached_semesters is not None:
                 logger.info("Using cached marks semesters data")
-                return self.marks_semesters
+                self.marks_semesters = cached_semesters
+                return cached_semesters
 
             # Set loading state
             self.marks_loading = True
@@ -434,93 +600,51 @@ class JIITChecker:
             if not webportal:
                 raise APIError("No webportal session available")
 
-            try:
-                semesters = webportal.get_semesters_for_marks()
-                logger.info("Successfully fetched marks semesters using get_semesters_for_marks")
-            except AttributeError:
-                # Fallback to grade card semesters if marks semesters not available
-                logger.info("get_semesters_for_marks not found, using get_semesters_for_grade_card")
-                semesters = webportal.get_semesters_for_grade_card()
+            semesters = self._marks_semesters_fn(webportal)()
 
             semester_names = []
+            sem_index = {}
             if semesters:
                 for semester in semesters:
                     semester_name = getattr(semester, 'semester_name', str(semester))
-                    logger.info(f"Processing semester: {semester_name}")
-
-                    import re
-                    reg_code_match = re.search(r'\(([^)]+)\)', semester_name)
-                    reg_code = reg_code_match.group(1) if reg_code_match else ""
-
-                    # If no parentheses, try to extract from the semester object attributes
-                    if not reg_code:
-                        reg_code = getattr(semester, 'registration_code', '')
-
-                    year = None
-                    reg_code_upper = reg_code.upper() if reg_code else semester_name.upper()
-
-                    # Try multiple patterns to extract year
-                    year_patterns = [
-                        r'(\d{4})',  # 4-digit year
-                        r'(\d{2})(\d{2})',  # Two 2-digit numbers (like 24 25)
-                        r'(\d{2})',  # 2-digit year
-                    ]
-
-                    for pattern in year_patterns:
-                        year_match = re.search(pattern, reg_code_upper)
-                        if year_match:
-                            year_part = year_match.group(1)
-                            # Convert 2-digit year to 4-digit
-                            if len(year_part) == 2:
-                                year_num = int(year_part)
-                                # Assume years 50-99 are 1900s, 00-49 are 2000s
-                                if year_num >= 50:
-                                    year = f"19{year_part}"
-                                else:
-                                    year = f"20{year_part}"
-                            else:
-                                year = year_part
-                            break
-
-                    # If still no year found, try to extract from semester name
-                    if not year:
-                        name_match = re.search(r'(\d{4})', semester_name.upper())
-                        if name_match:
-                            year = name_match.group(1)
-
-                    # Determine semester type and create simple display name
-                    if 'ODD' in reg_code_upper or 'ODD' in semester_name.upper():
-                        display_name = f"Odd {year}" if year else "Odd Semester"
-                    elif 'EVE' in reg_code_upper or 'EVEN' in semester_name.upper():
-                        display_name = f"Even {year}" if year else "Even Semester"
-                    elif 'SUMMER' in reg_code_upper or 'SUMMER' in semester_name.upper():
-                        display_name = f"Summer {year}" if year else "Summer Semester"
-                    else:
-                        # For unknown semester types, use the original name
-                        display_name = semester_name if semester_name else "Unknown Semester"
+                    logger.debug("Processing semester: %s", semester_name)
 
+                    reg_code = _semester_reg_code(semester, semester_name)
+                    display_name, _type, _year = _build_display_name(semester_name, reg_code)
                     semester_names.append(display_name)
+                    sem_index[display_name] = semester
 
             # Update state and cache
             self.marks_semesters = semester_names
+            self._sem_index = sem_index
             self._set_cache('marks_semesters', semester_names)
             self.marks_loading = False
 
-            logger.info(f"Fetched {len(semester_names)} marks semesters")
+            logger.info("Fetched %s marks semesters", len(semester_names))
             return semester_names
 
         except Exception as e:
             self.marks_loading = False
-            logger.error(f"Error fetching marks semesters: {e}")
+            logger.error("Error fetching marks semesters: %s", e)
             raise
 
+    def _resolve_semester(self, display_name: str):
+        if self._is_cache_valid('marks_semesters') and display_name in self._sem_index:
+            return self._sem_index[display_name]
+        # The cached name list may outlive the index (it is not rebuilt from a
+        # cache hit); drop the entry so fetch_marks_semesters does a real fetch
+        with self._cache_lock:
+            self.marks_cache.pop('marks_semesters', None)
+        self.fetch_marks_semesters()
+        return self._sem_index.get(display_name)
+
     def select_marks_semester(self, semester: str) -> None:
         if semester in self.marks_semesters:
             self.selected_marks_sem = semester
-            logger.info(f"Selected semester: {semester}")
+            logger.info("Selected semester: %s", semester)
             self.fetch_marks_for_semester(semester)
         else:
-            logger.warning(f"Invalid semester: {semester}")
+            logger.warning("Invalid semester: %s", semester)
 
     def get_current_marks(self) -> Optional[Dict[str, Any]]:
         if self.selected_marks_sem and self.selected_marks_sem in self.marks_data:
@@ -533,7 +657,7 @@ class JIITChecker:
             return False
 
         if semester not in self.marks_data:
-            logger.error(f"No data for semester {semester}. Fetch first.")
+            logger.error("No data for semester %s. Fetch first.", semester)
             return False
 
         try:
@@ -542,43 +666,10 @@ class JIITChecker:
                 raise APIError("No webportal session available")
 
             # Find the Semester object that matches the semester name
-            try:
-                semesters = webportal.get_semesters_for_marks()
-            except AttributeError:
-                semesters = webportal.get_semesters_for_grade_card()
-
-            target_semester = None
-            for sem in semesters:
-                semester_name = getattr(sem, 'semester_name', str(sem))
-
-                # Extract registration code and create display name (same logic as fetch_marks_semesters)
-                import re
-                reg_code_match = re.search(r'\(([^)]+)\)', semester_name)
-                reg_code = reg_code_match.group(1) if reg_code_match else ""
-                if not reg_code:
-                    reg_code = getattr(sem, 'registration_code', '')
-
-                year = None
-                reg_code_upper = reg_code.upper() if reg_code else semester_name.upper()
-                if reg_code:
-                    year_match = re.search(r'(\d{4})', reg_code)
-                    if year_match:
-                        year = year_match.group(1)
-
-                display_name = semester_name
-                if 'ODD' in reg_code_upper or 'ODD' in semester_name.upper():
-                    display_name = f"Odd {year}" if year else "Odd Semester"
-                elif 'EVE' in reg_code_upper or 'EVEN' in semester_name.upper():
-                    display_name = f"Even {year}" if year else "Even Semester"
-                elif 'SUMMER' in reg_code_upper or 'SUMMER' in semester_name.upper():
-                    display_name = f"Summer {year}" if year else "Summer Semester"
-
-                if display_name == semester:
-                    target_semester = sem
-                    break
+            target_semester = self._resolve_semester(semester)
 
             if not target_semester:
-                logger.error(f"Semester {semester} not found for download")
+                logger.error("Semester %s not found for download", semester)
                 return False
 
             # Download marks using the Semester object
@@ -588,11 +679,11 @@ class JIITChecker:
             with open(file_path, 'wb') as f:
                 f.write(pdf_bytes)
             
-            logger.info(f"Downloaded marks to {file_path}")
+            logger.info("Downloaded marks to %s", file_path)
             return True
 
         except Exception as e:
-            logger.error(f"Download failed: {e}")
+            logger.error("Download failed: %s", e)
             return False
 
     def fetch_marks_for_semester(self, semester: str) -> Optional[Dict[str, Any]]:
@@ -600,9 +691,12 @@ class JIITChecker:
             cache_key = f"marks_semester_{semester}"
 
             # Check cache first
-            if self._is_cache_valid(cache_key):
-                logger.info(f"Using cached marks data for semester: {semester}")
-                return self._get_cache(cache_key)
+            cached = self._get_cache(cache_key)
+            if cached is not None:
+                logger.info("Using cached marks data for semester: %s", semester)
+                self.marks_semester_data = cached
+                self.marks_data[semester] = cached
+                return cached
 
             # Set loading state
             self.marks_loading = True
@@ -610,110 +704,29 @@ class JIITChecker:
             if not self.ensure_logged_in():
                 raise LoginError("Failed to establish valid session")
 
-            logger.info(f"Fetching marks for semester: {semester}")
+            logger.info("Fetching marks for semester: %s", semester)
             webportal = self.session_manager.get_webportal()
             if not webportal:
                 raise APIError("No webportal session available")
 
-            # Get marks data using the correct pyjiit method
-            try:
-                # Use get_semesters_for_marks to find the correct semester object
-                semesters = webportal.get_semesters_for_marks()
-                logger.info("Successfully fetched semesters for marks")
-            except AttributeError:
-                # Fallback to grade card semesters if marks semesters not available
-                logger.info("get_semesters_for_marks not found, using get_semesters_for_grade_card")
-                semesters = webportal.get_semesters_for_grade_card()
-
-            # Find the target semester object
-            target_semester = None
-            logger.info(f"Looking for semester: {semester}")
-            logger.info(f"Available semesters: {[getattr(s, 'semester_name', str(s)) for s in semesters]}")
-
-            for sem in semesters:
-                semester_name = getattr(sem, 'semester_name', str(sem))
-
-                # Extract registration code from semester name (same logic as in fetch_marks_semesters)
-                import re
-                reg_code_match = re.search(r'\(([^)]+)\)', semester_name)
-                reg_code = reg_code_match.group(1) if reg_code_match else ""
-
-                # If no parentheses, try to extract from the semester object attributes
-                if not reg_code:
-                    reg_code = getattr(sem, 'registration_code', '')
-
-                # Extract year from registration code - more robust extraction
-                year = None
-                reg_code_upper = reg_code.upper() if reg_code else semester_name.upper()
-
-                # Try multiple patterns to extract year
-                year_patterns = [
-                    r'(\d{4})',  # 4-digit year
-                    r'(\d{2})(\d{2})',  # Two 2-digit numbers (like 24 25)
-                    r'(\d{2})',  # 2-digit year
-                ]
-
-                for pattern in year_patterns:
-                    year_match = re.search(pattern, reg_code_upper)
-                    if year_match:
-                        year_part = year_match.group(1)
-                        # Convert 2-digit year to 4-digit
-                        if len(year_part) == 2:
-                            year_num = int(year_part)
-                            # Assume years 50-99 are 1900s, 00-49 are 2000s
-                            if year_num >= 50:
-                                year = f"19{year_part}"
-                            else:
-                                year = f"20{year_part}"
-                        else:
-                            year = year_part
-                        break
-
-                # If still no year found, try to extract from semester name
-                if not year:
-                    name_match = re.search(r'(\d{4})', semester_name.upper())
-                    if name_match:
-                        year = name_match.group(1)
-
-                # Determine semester type and create display name (same as fetch_marks_semesters)
-                display_name = semester_name  # Default fallback
-                if 'ODD' in reg_code_upper or 'ODD' in semester_name.upper():
-                    display_name = f"Odd {year}" if year else "Odd Semester"
-                elif 'EVE' in reg_code_upper or 'EVEN' in semester_name.upper():
-                    display_name = f"Even {year}" if year else "Even Semester"
-                elif 'SUMMER' in reg_code_upper or 'SUMMER' in semester_name.upper():
-                    display_name = f"Summer {year}" if year else "Summer Semester"
-
-                # Check if the display name matches the selected semester
-                if display_name == semester:
-                    target_semester = sem
-                    logger.info(f"Found matching semester: {display_name} for selected: {semester}")
-                    break
-                else:
-                    logger.debug(f"Semester {display_name} does not match selected {semester}")
+            # Find the target semester object via the cached display-name index
+            logger.info("Looking for semester: %s", semester)
+            target_semester = self._resolve_semester(semester)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Available semesters: %s", self.marks_semesters)
 
             if not target_semester:
-                logger.error(f"Semester {semester} not found among available semesters")
+                logger.error("Semester %s not found among available semesters", semester)
                 raise ValueError(f"Semester {semester} not found")
 
             # Fetch grade card for the target semester
-            max_retries = 3
-            grade_card = None
-            for attempt in range(max_retries):
-                try:
-                    logger.info(f"Fetching grade card for semester {semester} (attempt {attempt + 1})")
-                    grade_card = webportal.get_grade_card(target_semester)
-                    if grade_card:
-                        logger.info(f"Grade card fetched successfully for {semester}")
-                        break
-                    else:
-                        logger.warning(f"Grade card fetch returned None for {semester}")
-                except Exception as e:
-                    if attempt == max_retries - 1:
-                        logger.error(f"Failed to fetch grade card after {max_retries} attempts: {e}")
-                        raise e
-                    logger.warning(f"Attempt {attempt + 1} failed to fetch grade card, retrying: {e}")
-                    time.sleep(1)
+            logger.info("Fetching grade card for semester %s", semester)
+            grade_card = _with_retries(lambda: webportal.get_grade_card(target_semester),
+                                       description=f"grade card fetch for {semester}")
+            if grade_card:
+                logger.info("Grade card fetched successfully for %s", semester)
+            else:
+                logger.warning("Grade card fetch returned None for %s", semester)
 
             marks_data = {
                 'subjects': {},
@@ -730,29 +743,29 @@ class JIITChecker:
                         'grade': ''
                     }
 
-                logger.info(f"Found {len(grade_card['gradecard'])} subjects from API for {semester}")
+                logger.info("Found %s subjects from API for %s", len(grade_card['gradecard']), semester)
             else:
-                logger.warning(f"No grade card data found for {semester}")
+                logger.warning("No grade card data found for %s", semester)
 
             # If no subjects found from API, try extracting from PDF
             if not marks_data['subjects']:
                 logger.info("No marks found in API response, trying PDF extraction")
                 try:
-                    logger.info(f"Downloading PDF for semester: {semester}")
+                    logger.info("Downloading PDF for semester: %s", semester)
                     pdf_bytes = webportal.download_marks(target_semester)
                     if pdf_bytes:
-                        logger.info(f"PDF downloaded successfully, size: {len(pdf_bytes)} bytes")
+                        logger.info("PDF downloaded successfully, size: %s bytes", len(pdf_bytes))
                         pdf_subjects = self._extract_marks_from_pdf(pdf_bytes)
 
                         if pdf_subjects:
                             marks_data['subjects'] = pdf_subjects
-                            logger.info(f"Successfully extracted {len(pdf_subjects)} subjects from PDF")
+                            logger.info("Successfully extracted %s subjects from PDF", len(pdf_subjects))
                         else:
                             logger.warning("No marks found in PDF either")
                     else:
                         logger.warning("PDF download returned empty data")
                 except Exception as e:
-                    logger.error(f"Error downloading/extracting marks from PDF: {e}")
+                    logger.error("Error downloading/extracting marks from PDF: %s", e)
                     # Don't re-raise the exception, just log it and continue with empty marks
 
             # Update state and cache
@@ -761,12 +774,12 @@ class JIITChecker:
             self._set_cache(cache_key, marks_data)
             self.marks_loading = False
 
-            logger.info(f"Marks fetched for semester {semester}: {len(marks_data['subjects'])} subjects")
+            logger.info("Marks fetched for semester %s: %s subjects", semester, len(marks_data['subjects']))
             return marks_data
 
         except Exception as e:
             self.marks_loading = False
-            logger.error(f"Error fetching marks for semester {semester}: {e}")
+            logger.error("Error fetching marks for semester %s: %s", semester, e)
             raise
 
     def fetch_notices(self) -> List[Dict[str, Any]]:
@@ -783,12 +796,25 @@ class JIITChecker:
                     'type': 'system'
                 }
             ]
-            logger.info(f"Fetched {len(notices)} notices")
+            logger.info("Fetched %s notices", len(notices))
             return notices
         except Exception as e:
-            logger.error(f"Error fetching notices: {e}")
+            logger.error("Error fetching notices: %s", e)
             raise
 
+    def fetch_all(self) -> Dict[str, Any]:
+        if not self.ensure_logged_in():
+            raise LoginError("Failed to establish valid session")
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            attendance_future = executor.submit(self.fetch_attendance)
+            marks_future = executor.submit(self.fetch_marks)
+            notices_future = executor.submit(self.fetch_notices)
+            return {
+                'attendance': attendance_future.result(),
+                'marks': marks_future.result(),
+                'notices': notices_future.result()
+            }
+
     def check_for_changes(self) -> Dict[str, Any]:
         changes = {
             'attendance_changed': False,
@@ -798,128 +824,173 @@ class JIITChecker:
             'current_data': {}
         }
         try:
-            current_attendance = self.fetch_attendance()
-            current_marks = self.fetch_marks()
-            current_notices = self.fetch_notices()
-            changes['current_data'] = {
-                'attendance': current_attendance,
-                'marks': current_marks,
-                'notices': current_notices
-            }
+            current_data = self.fetch_all()
+            current_attendance = current_data['attendance']
+            current_marks = current_data['marks']
+            current_notices = current_data['notices']
+            changes['current_data'] = current_data
+            attendance_digest = self._subjects_digest(current_attendance.get('subjects', {}))
             if self.last_attendance_data:
-                if current_attendance['attendance_percentage'] != self.last_attendance_data.get('attendance_percentage'):
+                percentage_moved = not math.isclose(
+                    current_attendance['attendance_percentage'],
+                    self.last_attendance_data.get('attendance_percentage', 0.0),
+                    abs_tol=0.05
+                )
+                if percentage_moved or attendance_digest != self._last_attendance_digest:
                     changes['attendance_changed'] = True
-                    logger.info("Attendance percentage changed")
-            threshold = float(os.getenv('ATTENDANCE_THRESHOLD', 75))
+                    logger.info("Attendance data changed")
+            threshold = self._attendance_threshold
             if current_attendance['attendance_percentage'] < threshold:
                 changes['attendance_below_threshold'] = True
-                logger.warning(f"Attendance below threshold: {current_attendance['attendance_percentage']:.1f}% < {threshold}%")
+                logger.warning("Attendance below threshold: %.1f%% < %s%%", current_attendance['attendance_percentage'], threshold)
+            marks_digest = self._subjects_digest(current_marks.get('subjects', {}))
             if self.last_marks_data:
-                if current_marks['cgpa'] != self.last_marks_data.get('cgpa'):
+                cgpa_moved = not math.isclose(
+                    current_marks['cgpa'],
+                    self.last_marks_data.get('cgpa', 0.0),
+                    abs_tol=0.005
+                )
+                if cgpa_moved or marks_digest != self._last_marks_digest:
                     changes['marks_changed'] = True
-                    logger.info("CGPA changed")
-            last_notice_ids = {notice['id'] for notice in self.last_notices}
-            current_notice_ids = {notice['id'] for notice in current_notices}
-            new_notice_ids = current_notice_ids - last_notice_ids
-            if new_notice_ids:
-                changes['new_notices'] = [
-                    notice for notice in current_notices
-                    if notice['id'] in new_notice_ids
-                ]
-                logger.info(f"Found {len(changes['new_notices'])} new notices")
+                    logger.info("Marks data changed")
+            notice_sig = hashlib.blake2b(
+                '|'.join(str(notice['id']) for notice in current_notices).encode(),
+                digest_size=8
+            ).digest()
+            if notice_sig != self._last_notice_sig:
+                last_notice_ids = self._last_notice_id_set
+                current_notice_ids = {notice['id'] for notice in current_notices}
+                new_notice_ids = current_notice_ids - last_notice_ids
+                if new_notice_ids:
+                    changes['new_notices'] = [
+                        notice for notice in current_notices
+                        if notice['id'] in new_notice_ids
+                    ]
+                    logger.info("Found %s new notices", len(changes['new_notices']))
+            self._last_notice_sig = notice_sig
             self.last_attendance_data = current_attendance
+            self._last_attendance_digest = attendance_digest
             self.last_marks_data = current_marks
+            self._last_marks_digest = marks_digest
             self.last_notices = current_notices
             return changes
         except Exception as e:
-            logger.error(f"Error checking for changes: {e}")
+            logger.error("Error checking for changes: %s", e)
             raise
 
-    def get_formatted_attendance_summary(self) -> str:
+    def get_formatted_attendance_summary(self, attendance: Optional[Dict[str, Any]] = None) -> str:
         try:
-            attendance = self.fetch_attendance()
-            summary = f"*Attendance Summary*\n\n"
-            summary += f"Overall: {attendance['attendance_percentage']:.1f}% "
-            summary += f"({attendance['attended_classes']}/{attendance['total_classes']} classes)\n\n"
-            summary += "*Subject-wise:*\n"
-            summary += f"{'Subject':<20} {'%':<6}\n"
-            summary += f"{'-'*20} {'-'*6}\n"
-            for subject, data in attendance['subjects'].items():
-                short_name = get_short_subject_name(subject)
-                summary += f"{short_name:<20} {data['percentage']:>5.1f}%\n"
+            if attendance is None:
+                cached = self._get_cache('attendance_summary')
+                if cached is not None:
+                    logger.info("Using cached attendance summary")
+                    return cached
+                if self.last_attendance_data and time.time() - self.last_attendance_data.get('last_updated', 0) < 60:
+                    attendance = self.last_attendance_data
+                else:
+                    attendance = self.fetch_attendance()
+            parts = [
+                "*Attendance Summary*\n\n",
+                f"Overall: {attendance['attendance_percentage']:.1f}% ",
+                f"({attendance['attended_classes']}/{attendance['total_classes']} classes)\n\n",
+                "*Subject-wise:*\n",
+                f"{'Subject':<20} {'%':<6}\n",
+                f"{'-'*20} {'-'*6}\n"
+            ]
+            parts.append(''.join(
+                f"{get_short_subject_name(subject):<20} {data['percentage']:>5.1f}%\n"
+                for subject, data in attendance['subjects'].items()
+            ))
+            summary = ''.join(parts)
+            self._set_cache('attendance_summary', summary)
             return summary
         except Exception as e:
-            logger.error(f"Error getting attendance summary: {e}")
+            logger.error("Error getting attendance summary: %s", e)
             return "Unable to fetch attendance data"
 
-    def get_formatted_marks_summary(self) -> str:
+    def get_formatted_marks_summary(self, marks: Optional[Dict[str, Any]] = None) -> str:
         try:
-            marks = self.fetch_marks()
-            summary = f"*Marks Summary*\n\n"
-            summary += f"Current CGPA: {marks['cgpa']:.2f}\n"
+            if marks is None:
+                cached = self._get_cache('marks_summary')
+                if cached is not None:
+                    logger.info("Using cached marks summary")
+                    return cached
+                if self.last_marks_data and time.time() - self.last_marks_data.get('last_updated', 0) < 60:
+                    marks = self.last_marks_data
+                else:
+                    marks = self.fetch_marks()
+            parts = ["*Marks Summary*\n\n", f"Current CGPA: {marks['cgpa']:.2f}\n"]
             if marks['sgpa'] > 0:
-                summary += f"Current SGPA: {marks['sgpa']:.2f}\n"
-            summary += "\n"
+                parts.append(f"Current SGPA: {marks['sgpa']:.2f}\n")
+            parts.append("\n")
             if marks['subjects']:
-                summary += "*Subject-wise Marks:*\n"
-                for subject, data in marks['subjects'].items():
-                    short_name = get_short_subject_name(subject)
-                    summary += f"- {short_name}: {data['total']} (Internal: {data['internal']}, External: {data['external']})\n"
+                parts.append("*Subject-wise Marks:*\n")
+                parts.append(''.join(
+                    f"- {get_short_subject_name(subject)}: {data['total']} (Internal: {data['internal']}, External: {data['external']})\n"
+                    for subject, data in marks['subjects'].items()
+                ))
             else:
-                summary += "*No detailed subject marks available*\n"
+                parts.append("*No detailed subject marks available*\n")
+            summary = ''.join(parts)
+            self._set_cache('marks_summary', summary)
             return summary
         except Exception as e:
-            logger.error(f"Error getting marks summary: {e}")
+            logger.error("Error getting marks summary: %s", e)
             return "Unable to fetch marks data"
 
     def cleanup(self):
         try:
+            if self._api_session is not None:
+                self._api_session.close()
+                self._api_session = None
             if self.session_manager:
                 logger.info("Cleaning up session...")
                 self.session_manager.logout()
                 self.session_manager = None
         except Exception as e:
-            logger.error(f"Error during cleanup: {e}")
+            logger.error("Error during cleanup: %s", e)
 
     def _extract_marks_from_pdf(self, pdf_bytes: bytes) -> Dict[str, Dict[str, Any]]:
+        pdf_hash = hashlib.sha256(pdf_bytes).digest()
+        if pdf_hash == self._last_pdf_hash and self._last_pdf_subjects:
+            logger.info("PDF unchanged, reusing previously extracted marks")
+            return self._last_pdf_subjects
         try:
+            import pdfplumber
+
             pdf_file = io.BytesIO(pdf_bytes)
             with pdfplumber.open(pdf_file) as pdf:
                 text_content = ''
                 for page in pdf.pages:
+                    # Cover/blank pages have almost no characters; skip the
+                    # full text-extraction pass for them
+                    if len(page.chars) < 50:
+                        continue
                     page_text = page.extract_text()
                     if page_text:
                         text_content += page_text + '\n'
             
             # Parse the text to extract marks
             subjects = {}
-            lines = text_content.split('\n')
-            
+            # Strip once up front and drop blank lines so the scanner sees
+            # subject / marks / code rows as direct neighbours
+            lines = [line for line in (raw.strip() for raw in text_content.split('\n')) if line]
+            line_count = len(lines)
+
             i = 0
-            while i < len(lines):
-                line = lines[i].strip()
+            while i < line_count:
+                line = lines[i]
                 
                 # Look for subject names (they don't start with special characters and are followed by marks)
-                if (line and 
-                    not line.startswith('(') and 
-                    not line.startswith('Page') and
-                    not line.startswith('Jaypee') and
-                    not line.startswith('Subject') and
-                    not line.startswith('Name:') and
-                    not line.startswith('Registration') and
-                    not line.startswith('Legend') and
-                    not line.startswith('OM/FM') and
-                    not line.startswith('Thu') and
-                    not line.startswith('A-10') and
-                    not line.startswith('Noida') and
-                    not any(char.isdigit() for char in line[:10]) and  # Avoid lines starting with numbers
-                    len(line) > 10):  # Subject names are usually long enough
+                if (len(line) > 10 and  # Subject names are usually long enough
+                    not line.startswith(_PDF_SKIP_PREFIXES) and
+                    not _RE_EARLY_DIGIT.search(line, 0, 10)):  # Avoid lines starting with numbers
                     
                     subject_name = line
                     
                     # Look for marks in the next line
-                    if i + 1 < len(lines):
-                        marks_line = lines[i + 1].strip()
+                    if i + 1 < line_count:
+                        marks_line = lines[i + 1]
                         
                         # Parse marks (format: "1.5/ 20 1.5/20.0" or "A 0.0/20.0")
                         marks_data = self._parse_marks_line(marks_line)
@@ -927,8 +998,8 @@ class JIITChecker:
                         if marks_data:
                             # Look for subject code in the next line
                             subject_code = ""
-                            if i + 2 < len(lines):
-                                code_line = lines[i + 2].strip()
+                            if i + 2 < line_count:
+                                code_line = lines[i + 2]
                                 if code_line.startswith('(') and code_line.endswith(')'):
                                     subject_code = code_line[1:-1]  # Remove parentheses
                             
@@ -944,17 +1015,28 @@ class JIITChecker:
                 
                 i += 1
             
-            logger.info(f"Extracted marks for {len(subjects)} subjects from PDF")
+            logger.info("Extracted marks for %s subjects from PDF", len(subjects))
+            self._last_pdf_hash = pdf_hash
+            self._last_pdf_subjects = subjects
             return subjects
             
         except Exception as e:
-            logger.error(f"Error extracting marks from PDF: {e}")
+            logger.error("Error extracting marks from PDF: %s", e)
             return {}
 
     def _parse_marks_line(self, marks_line: str) -> Optional[Dict[str, Any]]:
         try:
             marks_line = marks_line.strip()
 
+            m = _MARKS_LINE_RE.match(marks_line)
+            if m:
+                if m.group('absent'):
+                    return {'t1': 'A', 'grade': ''}
+                if m.group('grade'):
+                    return {'t1': float(m.group('gval')), 'grade': m.group('grade')}
+                return {'t1': float(m.group('num')), 'grade': ''}
+
+            # Fall back to the tokenizing scan for layouts the pattern misses
             # Handle absent case (e.g., "A 0.0/20.0") - A means absent, not a grade
             if marks_line.startswith('A ') and len(marks_line.split()) >= 2:
                 parts = marks_line.split()
@@ -997,5 +1079,5 @@ class JIITChecker:
             return None
 
         except Exception as e:
-            logger.error(f"Error parsing marks line '{marks_line}': {e}")
+            logger.error("Error parsing marks line '%s': %s", marks_line, e)
             return None
@@ -4,15 +4,28 @@ import logging
 import threading
 import time
 import signal
+import functools
+from dataclasses import dataclass
+from logging.handlers import RotatingFileHandler
 from typing import Optional
 from dotenv import load_dotenv
 
 from jiit_checker import JIITChecker
 from telegram_notifier import TelegramNotifier
 
-jiit_checker: Optional[JIITChecker] = None
-notifier: Optional[TelegramNotifier] = None
-running = True
+@dataclass
+class AppContext:
+    jiit_checker: JIITChecker
+    notifier: TelegramNotifier
+    shutdown: threading.Event
+
+_context: Optional[AppContext] = None
+_dotenv_loaded = False
+
+STARTED_MESSAGE = "PortalPlus Started\n\nYour portal monitoring is now active.\n\nI'll alert you about:\n- Low attendance warnings\n\nSend /help anytime for commands."
+LIMITED_MODE_MESSAGE = "PortalPlus Started (Limited Mode)\n\nTelegram bot is active, but portal connection failed.\n\nPortal login will be retried automatically.\nSend /help for available commands."
+CONNECTION_ISSUES_MESSAGE = "Portal Connection Issues\n\nUnable to connect to JIIT portal after multiple attempts.\n\nTelegram bot remains active, but portal monitoring is temporarily disabled.\nWill continue trying to reconnect..."
+MONITORING_ERROR_MESSAGE = "Monitoring Error\n\nExperiencing technical difficulties with portal monitoring.\n\nTelegram bot remains active. Will keep trying to restore monitoring..."
 
 def setup_logging():
     log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
@@ -22,23 +35,33 @@ def setup_logging():
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         handlers=[
             logging.StreamHandler(sys.stdout),
-            logging.FileHandler('logs/portalplus.log', encoding='utf-8')
+            RotatingFileHandler('logs/portalplus.log', maxBytes=5_000_000, backupCount=3, encoding='utf-8')
         ]
     )
     logging.getLogger('urllib3').setLevel(logging.WARNING)
     logging.getLogger('twilio').setLevel(logging.WARNING)
     logging.getLogger('werkzeug').setLevel(logging.WARNING)
 
+def setup_event_loop():
+    try:
+        import uvloop
+        uvloop.install()
+        logging.info("uvloop event loop policy installed")
+    except ImportError:
+        logging.debug("uvloop not available, using default asyncio event loop")
+
 def load_environment():
-    load_dotenv()
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        load_dotenv()
+        _dotenv_loaded = True
     required_vars = ['JIIT_USERNAME', 'JIIT_PASSWORD', 'TELEGRAM_BOT_TOKEN', 'TELEGRAM_CHAT_ID']
     missing_vars = [var for var in required_vars if not os.getenv(var)]
     if missing_vars:
         raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
     logging.info("Environment variables loaded successfully")
 
-def initialize_services():
-    global jiit_checker, notifier
+def initialize_services() -> Optional[AppContext]:
     try:
         username = os.getenv('JIIT_USERNAME')
         password = os.getenv('JIIT_PASSWORD')
@@ -48,110 +71,122 @@ def initialize_services():
 
         if jiit_checker.login():
             logging.info("JIIT portal login successful")
-            notifier.send_message_sync("PortalPlus Started\n\nYour portal monitoring is now active.\n\nI'll alert you about:\n- Low attendance warnings\n\nSend /help anytime for commands.")
+            notifier.send_message_sync(STARTED_MESSAGE)
         else:
             logging.warning("JIIT portal login failed, but Telegram bot will still work")
-            notifier.send_message_sync("PortalPlus Started (Limited Mode)\n\nTelegram bot is active, but portal connection failed.\n\nPortal login will be retried automatically.\nSend /help for available commands.")
+            notifier.send_message_sync(LIMITED_MODE_MESSAGE)
 
         notifier.run_bot()
         logging.info("Services initialized (portal connection may be retried)")
-        return True
+        return AppContext(jiit_checker=jiit_checker, notifier=notifier, shutdown=threading.Event())
     except Exception as e:
-        logging.error(f"Failed to initialize core services: {e}")
-        return False
+        logging.error("Failed to initialize core services: %s", e)
+        return None
 
-def periodic_check():
-    global running, jiit_checker, notifier
+def periodic_check(ctx: AppContext):
+    jiit_checker = ctx.jiit_checker
+    notifier = ctx.notifier
+    shutdown_event = ctx.shutdown
     logging.info("Starting periodic monitoring with dynamic interval checking")
     consecutive_failures = 0
     max_failures = 3
+    stable_cycles = 0
 
-    while running:
+    while not shutdown_event.is_set():
         try:
-            check_interval = int(os.getenv('CHECK_INTERVAL_MINUTES', 60)) * 60
-            if not jiit_checker or not notifier:
-                logging.error("Services not properly initialized")
-                break
-
-            logging.info(f"Starting periodic portal check (next check in {check_interval // 60} minutes)...")
+            base_interval = int(os.getenv('CHECK_INTERVAL_MINUTES', 60)) * 60
+            logging.info("Starting periodic portal check...")
 
             if not jiit_checker.ensure_logged_in():
                 consecutive_failures += 1
-                logging.warning(f"Portal connection failed (attempt {consecutive_failures}/{max_failures})")
+                logging.warning("Portal connection failed (attempt %s/%s)", consecutive_failures, max_failures)
                 if consecutive_failures >= max_failures:
-                    notifier.send_message_sync("Portal Connection Issues\n\nUnable to connect to JIIT portal after multiple attempts.\n\nTelegram bot remains active, but portal monitoring is temporarily disabled.\nWill continue trying to reconnect...")
+                    notifier.send_message_sync(CONNECTION_ISSUES_MESSAGE)
                     consecutive_failures = 0
-                time.sleep(300)
+                if shutdown_event.wait(300):
+                    break
                 continue
 
             consecutive_failures = 0
             changes = jiit_checker.check_for_changes()
 
+            # Notices carry synthetic per-fetch ids and would register as "new"
+            # every cycle, so only real data changes reset the backoff
+            if changes['attendance_changed'] or changes['marks_changed'] or changes['attendance_below_threshold']:
+                stable_cycles = 0
+            else:
+                stable_cycles = min(stable_cycles + 1, 2)
+            check_interval = min(base_interval * (2 ** stable_cycles), base_interval * 4)
+
             if changes['attendance_below_threshold']:
                 notifier.send_attendance_alert_sync(changes['current_data']['attendance'])
 
             attendance_pct = changes['current_data']['attendance']['attendance_percentage']
-            logging.info(f"Check completed - Attendance: {attendance_pct:.1f}% (next check in {check_interval // 60} minutes)")
+            logging.info("Check completed - Attendance: %.1f%% (next check in %s minutes)", attendance_pct, check_interval // 60)
 
             sleep_start_time = time.time()
-            while running and (time.time() - sleep_start_time) < check_interval:
-                current_interval = int(os.getenv('CHECK_INTERVAL_MINUTES', 60)) * 60
-                if current_interval != check_interval:
-                    logging.info(f"Interval changed from {check_interval // 60} to {current_interval // 60} minutes - adjusting schedule")
+            while not shutdown_event.is_set() and (time.time() - sleep_start_time) < check_interval:
+                current_base = int(os.getenv('CHECK_INTERVAL_MINUTES', 60)) * 60
+                if current_base != base_interval:
+                    logging.info("Interval changed from %s to %s minutes - adjusting schedule", base_interval // 60, current_base // 60)
+                    stable_cycles = 0
                     break
-                time.sleep(min(30, check_interval - (time.time() - sleep_start_time)))
+                shutdown_event.wait(min(30, check_interval - (time.time() - sleep_start_time)))
 
         except Exception as e:
             consecutive_failures += 1
-            logging.error(f"Error during periodic check: {e}")
+            logging.error("Error during periodic check: %s", e)
             if consecutive_failures >= max_failures and notifier:
                 try:
-                    notifier.send_message_sync("Monitoring Error\n\nExperiencing technical difficulties with portal monitoring.\n\nTelegram bot remains active. Will keep trying to restore monitoring...")
+                    notifier.send_message_sync(MONITORING_ERROR_MESSAGE)
                     consecutive_failures = 0
                 except:
                     pass
-            time.sleep(300)
-
-def signal_handler(signum, frame):
-    global running, jiit_checker, notifier
-    logging.info(f"Received signal {signum}, shutting down gracefully...")
-    running = False
-    if jiit_checker:
-        jiit_checker.cleanup()
-    if notifier:
-        notifier.cleanup()
+            shutdown_event.wait(300)
+
+def signal_handler(signum, frame, ctx: AppContext):
+    logging.info("Received signal %s, shutting down gracefully...", signum)
+    ctx.shutdown.set()
+    ctx.jiit_checker.cleanup()
+    ctx.notifier.cleanup()
     sys.exit(0)
 
 def get_jiit_checker() -> Optional[JIITChecker]:
-    return jiit_checker
+    return _context.jiit_checker if _context else None
 
 def main():
+    global _context
+    ctx = None
     try:
         setup_logging()
         logging.info("=== PortalPlus Starting ===")
+        setup_event_loop()
         load_environment()
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
 
-        if not initialize_services():
+        ctx = initialize_services()
+        if not ctx:
             logging.error("Failed to initialize services, exiting")
             sys.exit(1)
+        _context = ctx
+
+        handler = functools.partial(signal_handler, ctx=ctx)
+        signal.signal(signal.SIGINT, handler)
+        signal.signal(signal.SIGTERM, handler)
 
-        checker_thread = threading.Thread(target=periodic_check, daemon=True)
+        checker_thread = threading.Thread(target=periodic_check, args=(ctx,), daemon=True)
         checker_thread.start()
         logging.info("Monitoring system started, checking portal periodically...")
 
-        while running:
-            time.sleep(1)
+        ctx.shutdown.wait()
 
     except KeyboardInterrupt:
         logging.info("Application interrupted by user")
     except Exception as e:
-        logging.error(f"Unexpected error: {e}")
+        logging.error("Unexpected error: %s", e)
         sys.exit(1)
     finally:
-        if notifier:
-            notifier.cleanup()
+        if ctx:
+            ctx.notifier.cleanup()
         logging.info("=== PortalPlus Stopped ===")
 
 if __name__ == "__main__":
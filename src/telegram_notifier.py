@@ -1,4 +1,6 @@
 ﻿import os
+import re
+import itertools
 import logging
 import asyncio
 from typing import Optional, Dict, Any, List
@@ -10,6 +12,20 @@ from jiit_checker import get_short_subject_name
 
 logger = logging.getLogger(__name__)
 
+WELCOME_MESSAGE = "Welcome to PortalPlus!\n\nI'm your JIIT portal monitoring assistant.\n\nI monitor:\n- Attendance levels\n- Marks\n- Important notices\n\nAvailable Commands:\n/help - Show all commands\n/attendance - Check attendance\n/calc - Calculate attendance needs\n/interval - Set check interval\n/status - System status\n\nMonitoring is now active."
+HELP_MESSAGE = "<b>PortalPlus Help</b>\n\n<b>Available Commands:</b>\n\n<b>/start</b> - Welcome message\n<b>/help</b> - Show this help\n<b>/attendance</b> - Check attendance\n<b>/marks</b> - Check semester marks\n<b>/calc [percentage]</b> - Calculate additional classes needed to reach target attendance\n<b>/interval [minutes]</b> - Set check interval\n<b>/status</b> - Bot status"
+QUICK_HELP_MESSAGE = "Try these commands:\n/attendance - Check attendance\n/calc - Calculate attendance needs\n/interval - Set check interval\n/help - Full help menu"
+
+_INTENT_RE = re.compile(r'(?P<attendance>attend)|(?P<calc>calc)|(?P<interval>interval|time|check)|(?P<help>help|command)')
+_INTENT_PRIORITY = ('attendance', 'calc', 'interval', 'help')
+
+def _match_intent(message_text: str) -> Optional[str]:
+    found = {m.lastgroup for m in _INTENT_RE.finditer(message_text)}
+    for intent in _INTENT_PRIORITY:
+        if intent in found:
+            return intent
+    return None
+
 class TelegramNotifier:
     def __init__(self):
         self.bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
@@ -19,6 +35,7 @@ class TelegramNotifier:
         if not self.chat_id:
             raise ValueError("TELEGRAM_CHAT_ID environment variable is required")
         self.bot = Bot(token=self.bot_token)
+        self.attendance_threshold = float(os.getenv('ATTENDANCE_THRESHOLD', 75))
         self.application = None
         self.jiit_checker = None
         self._loop = None
@@ -81,38 +98,38 @@ class TelegramNotifier:
             attendance_pct = attendance_data.get('attendance_percentage', 0)
             subjects = attendance_data.get('subjects', {})
 
-            message = f"<b> Low Attendance Alert</b>\n\n"
+            threshold = self.attendance_threshold
+            parts = ["<b> Low Attendance Alert</b>\n\n"]
 
-            low_subjects = []
-            for subject, data in subjects.items():
-                percentage = data.get('percentage', 0)
-                if percentage < 75:
-                    low_subjects.append((subject, percentage))
+            low_subjects = [
+                (get_short_subject_name(subject), data.get('percentage', 0))
+                for subject, data in subjects.items()
+                if data.get('percentage', 0) < threshold
+            ]
 
             if low_subjects:
-                message += "<pre>"
-                message += "┌─────────────────┬────────────┐\n"
-                message += "│ Subject         │ Attendance │\n"
-                message += "├─────────────────┼────────────┤\n"
+                parts.append("<pre>")
+                parts.append("┌─────────────────┬────────────┐\n")
+                parts.append("│ Subject         │ Attendance │\n")
+                parts.append("├─────────────────┼────────────┤\n")
 
-                for subject, percentage in low_subjects[:8]:
-                    short_name = get_short_subject_name(subject)
+                for short_name, percentage in low_subjects[:8]:
                     if len(short_name) > 15:
                         short_name = short_name[:12] + "..."
-                    message += f"│ {short_name:<15} │ {percentage:>8.1f}%  │\n"
+                    parts.append(f"│ {short_name:<15} │ {percentage:>8.1f}%  │\n")
 
-                message += "└─────────────────┴────────────┘"
-                message += "</pre>"
+                parts.append("└─────────────────┴────────────┘")
+                parts.append("</pre>")
                 if attendance_pct >= 65:
                     status_text = "Warning"
                 else:
                     status_text = "Critical"
 
-                message += f"\n<b>Status: {status_text}</b> - {len(low_subjects)} subject(s) below 75%"
+                parts.append(f"\n<b>Status: {status_text}</b> - {len(low_subjects)} subject(s) below {threshold:.0f}%")
             else:
-                message += "<b>All subjects above 75%</b>"
+                parts.append(f"<b>All subjects above {threshold:.0f}%</b>")
 
-            await self.send_message(message, parse_mode='HTML')
+            await self.send_message(''.join(parts), parse_mode='HTML')
         except Exception as e:
             logger.error(f"Error sending attendance alert: {e}")
 
@@ -127,17 +144,17 @@ class TelegramNotifier:
             cgpa = marks_data.get('cgpa', 0.0)
             sgpa = marks_data.get('sgpa', 0.0)
             subjects = marks_data.get('subjects', {})
-            message = f"Marks Update\n\nCGPA: {cgpa:.2f}\nSGPA: {sgpa:.2f}\n\n"
+            parts = [f"Marks Update\n\nCGPA: {cgpa:.2f}\nSGPA: {sgpa:.2f}\n\n"]
             if subjects:
-                message += "Subject Updates:\n"
+                parts.append("Subject Updates:\n")
                 for subject, marks in list(subjects.items())[:5]:
                     short_name = get_short_subject_name(subject)
                     if isinstance(marks, dict):
                         marks_val = marks.get('marks', 'N/A')
-                        message += f"- {short_name}: {marks_val}\n"
+                        parts.append(f"- {short_name}: {marks_val}\n")
                     else:
-                        message += f"- {short_name}: {marks}\n"
-            await self.send_message(message, parse_mode='HTML')
+                        parts.append(f"- {short_name}: {marks}\n")
+            await self.send_message(''.join(parts), parse_mode='HTML')
         except Exception as e:
             logger.error(f"Error sending marks update: {e}")
 
@@ -145,14 +162,15 @@ class TelegramNotifier:
         try:
             if not notices:
                 return
-            message = "New Notices\n\n"
-            for notice in notices[:3]:
+            total = len(notices)
+            parts = ["New Notices\n\n"]
+            for notice in itertools.islice(notices, 3):
                 title = notice.get('title', 'No Title')[:60]
                 date = notice.get('date', 'No Date')
-                message += f"- {title}\n  Date: {date}\n\n"
-            if len(notices) > 3:
-                message += f"... and {len(notices) - 3} more notices"
-            await self.send_message(message, parse_mode='HTML')
+                parts.append(f"- {title}\n  Date: {date}\n\n")
+            if total > 3:
+                parts.append(f"... and {total - 3} more notices")
+            await self.send_message(''.join(parts), parse_mode='HTML')
         except Exception as e:
             logger.error(f"Error sending notices alert: {e}")
 
@@ -165,13 +183,27 @@ class TelegramNotifier:
     def set_jiit_checker(self, jiit_checker):
         self.jiit_checker = jiit_checker
 
+    def _get_cached_attendance(self) -> Optional[Dict[str, Any]]:
+        cache_age = (time.time() - self._cache_timestamp) / 60
+        if self._cached_attendance and cache_age < 30:
+            return self._cached_attendance
+        return None
+
+    def _fetch_attendance_data(self) -> Dict[str, Any]:
+        self._attendance_fetching = True
+        try:
+            attendance_data = self.jiit_checker.fetch_attendance()
+            self._cached_attendance = attendance_data
+            self._cache_timestamp = time.time()
+            return attendance_data
+        finally:
+            self._attendance_fetching = False
+
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        welcome_msg = "Welcome to PortalPlus!\n\nI'm your JIIT portal monitoring assistant.\n\nI monitor:\n- Attendance levels\n- Marks\n- Important notices\n\nAvailable Commands:\n/help - Show all commands\n/attendance - Check attendance\n/calc - Calculate attendance needs\n/interval - Set check interval\n/status - System status\n\nMonitoring is now active."
-        await update.message.reply_text(welcome_msg)
+        await update.message.reply_text(WELCOME_MESSAGE)
 
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        help_msg = "<b>PortalPlus Help</b>\n\n<b>Available Commands:</b>\n\n<b>/start</b> - Welcome message\n<b>/help</b> - Show this help\n<b>/attendance</b> - Check attendance\n<b>/marks</b> - Check semester marks\n<b>/calc [percentage]</b> - Calculate additional classes needed to reach target attendance\n<b>/interval [minutes]</b> - Set check interval\n<b>/status</b> - Bot status"
-        await update.message.reply_text(help_msg, parse_mode='HTML')
+        await update.message.reply_text(HELP_MESSAGE, parse_mode='HTML')
 
     async def attendance_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         try:
@@ -179,27 +211,19 @@ class TelegramNotifier:
                 await update.message.reply_text("Portal checker not available")
                 return
             
-            current_time = time.time()
-            cache_age = (current_time - self._cache_timestamp) / 60
-            
             if self._attendance_fetching:
                 await update.message.reply_text("Attendance check in progress, please wait...")
                 return
-            
-            if self._cached_attendance and cache_age < 30:
-                attendance_data = self._cached_attendance
+
+            attendance_data = self._get_cached_attendance()
+            if attendance_data:
+                cache_age = (time.time() - self._cache_timestamp) / 60
                 message_suffix = f"\n<i>Cached data ({int(cache_age)} min ago)</i>"
             else:
                 await update.message.reply_text("Fetching attendance data...")
-                self._attendance_fetching = True
-                try:
-                    attendance_data = self.jiit_checker.fetch_attendance()
-                    self._cached_attendance = attendance_data
-                    self._cache_timestamp = current_time
-                    message_suffix = "\n<i>Real-time data</i>"
-                finally:
-                    self._attendance_fetching = False
-            
+                attendance_data = self._fetch_attendance_data()
+                message_suffix = "\n<i>Real-time data</i>"
+
             attendance_pct = attendance_data.get('attendance_percentage', 0)
             subjects = attendance_data.get('subjects', {})
 
@@ -253,26 +277,18 @@ class TelegramNotifier:
                 await update.message.reply_text("Target percentage must be between 0 and 100")
                 return
 
-            current_time = time.time()
-            cache_age = (current_time - self._cache_timestamp) / 60
-            
             if self._attendance_fetching:
                 await update.message.reply_text("Attendance check in progress, please wait...")
                 return
-            
-            if self._cached_attendance and cache_age < 30:
-                attendance_data = self._cached_attendance
+
+            attendance_data = self._get_cached_attendance()
+            if attendance_data:
+                cache_age = (time.time() - self._cache_timestamp) / 60
                 data_info = f"Cached data ({int(cache_age)} min ago)"
             else:
                 await update.message.reply_text("Calculating requirements...")
-                self._attendance_fetching = True
-                try:
-                    attendance_data = self.jiit_checker.fetch_attendance()
-                    self._cached_attendance = attendance_data
-                    self._cache_timestamp = current_time
-                    data_info = "Real-time data"
-                finally:
-                    self._attendance_fetching = False
+                attendance_data = self._fetch_attendance_data()
+                data_info = "Real-time data"
 
             subjects = attendance_data.get('subjects', {})
 
@@ -429,18 +445,18 @@ class TelegramNotifier:
 
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         message_text = update.message.text.lower().strip()
-        
-        if any(word in message_text for word in ['attendance', 'attend']):
+        intent = _match_intent(message_text)
+
+        if intent == 'attendance':
             await self.attendance_command(update, context)
-        elif any(word in message_text for word in ['calc', 'calculate']):
+        elif intent == 'calc':
             await update.message.reply_text("Use: /calc [percentage]\nExample: /calc 60")
-        elif any(word in message_text for word in ['interval', 'time', 'check']):
+        elif intent == 'interval':
             await self.interval_command(update, context)
-        elif any(word in message_text for word in ['help', 'command']):
+        elif intent == 'help':
             await self.help_command(update, context)
         else:
-            quick_help = "Try these commands:\n/attendance - Check attendance\n/calc - Calculate attendance needs\n/interval - Set check interval\n/help - Full help menu"
-            await update.message.reply_text(quick_help)
+            await update.message.reply_text(QUICK_HELP_MESSAGE)
 
     def setup_bot(self):
         self.application = Application.builder().token(self.bot_token).build()
@@ -461,24 +477,36 @@ class TelegramNotifier:
                 logger.info("Starting Telegram bot...")
                 if not self.application:
                     self.setup_bot()
-                async def run_polling():
+                async def run_updater():
                     try:
                         await self.application.initialize()
                         await self.application.start()
                         logger.info("Telegram bot started successfully")
-                        await self.application.updater.start_polling(drop_pending_updates=True)
-                        logger.info("Telegram bot polling started")
+                        webhook_url = os.getenv('TELEGRAM_WEBHOOK_URL')
+                        if webhook_url:
+                            port = int(os.getenv('TELEGRAM_WEBHOOK_PORT', 8443))
+                            await self.application.updater.start_webhook(
+                                listen='0.0.0.0',
+                                port=port,
+                                url_path=self.bot_token,
+                                webhook_url=f"{webhook_url.rstrip('/')}/{self.bot_token}",
+                                drop_pending_updates=True
+                            )
+                            logger.info("Telegram bot webhook started")
+                        else:
+                            await self.application.updater.start_polling(drop_pending_updates=True)
+                            logger.info("Telegram bot polling started")
                         while True:
                             await asyncio.sleep(1)
                     except Exception as e:
-                        logger.error(f"Error in polling: {e}")
+                        logger.error(f"Error in updater: {e}")
                     finally:
                         try:
                             await self.application.stop()
                             await self.application.shutdown()
                         except Exception as e:
                             logger.error(f"Error during shutdown: {e}")
-                asyncio.run(run_polling())
+                asyncio.run(run_updater())
             except Exception as e:
                 logger.error(f"Error running Telegram bot: {e}")
         bot_thread_obj = threading.Thread(target=bot_thread, daemon=True)